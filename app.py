@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, render_template, request, jsonify, send_file, session, Response
 import os
 import sys
 from pathlib import Path
@@ -6,13 +6,12 @@ import time
 import re
 import asyncio
 import aiofiles
-from openai import OpenAI, AsyncOpenAI
+import aiohttp
+from openai import OpenAI, AsyncOpenAI, DefaultAioHttpClient
 from dotenv import load_dotenv
-import requests
 import unicodedata
 import subprocess
 import shutil
-from elevenlabs.client import ElevenLabs
 import logging
 import zipfile
 import io
@@ -21,9 +20,19 @@ from datetime import datetime
 import tempfile
 import uuid
 import json
-from tools_config import get_active_tools
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from tools_config import TOOLS_CONFIG, get_active_tools
 import torch
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
 # Load environment variables
 load_dotenv()
 
@@ -49,9 +58,75 @@ except ValueError as e:
     print("Please set your API keys in environment variables or .env file")
     sys.exit(1)
 
-# Initialize API clients
-openai_client = OpenAI(api_key=openai_api_key)
-eleven_labs_client = ElevenLabs(api_key=elevenlabs_api_key)
+# Chat model used for translations
+TRANSLATION_MODEL = os.environ.get("TRANSLATION_MODEL", "gpt-4o-mini")
+TRANSLATION_MAX_TOKENS = 600  # Per language; ad scripts are short
+
+# Opt in to translating all languages in one JSON-mode request. That is one
+# request instead of N, but the model writes the languages one after another,
+# so it is much slower than the default concurrent per-language requests.
+TRANSLATION_SINGLE_REQUEST = os.environ.get("TRANSLATION_SINGLE_REQUEST", "").lower() in ("1", "true", "yes")
+
+# Max in-flight OpenAI translation requests (stays under rate limits);
+# 429s and transient errors are retried by the client with backoff
+OPENAI_MAX_CONCURRENCY = max(1, int(os.environ.get("OPENAI_MAX_CONCURRENCY", 8)))
+OPENAI_MAX_RETRIES = 4
+
+# Initialize API clients (ElevenLabs is called over its HTTP API directly)
+openai_client = OpenAI(api_key=openai_api_key, max_retries=OPENAI_MAX_RETRIES)
+
+# In-process LRU cache of translations keyed by (text, language code, mode),
+# backed by a disk cache. A translation expires from both TRANSLATION_CACHE_TTL
+# after it was last written to or loaded from disk.
+TRANSLATION_CACHE_SIZE = 512
+TRANSLATION_CACHE_DIR = Path("temp_files/translation_cache")
+TRANSLATION_CACHE_TTL = 30 * 24 * 3600  # seconds
+TRANSLATION_DISK_CACHE_MAX_BYTES = 50 * 1024 ** 2
+_translation_cache = OrderedDict()
+_translation_cache_lock = threading.Lock()
+
+# Max simultaneous ElevenLabs connections (keeps us under their concurrency limit,
+# which depends on the subscription tier)
+ELEVENLABS_MAX_CONCURRENCY = max(1, int(os.environ.get("ELEVENLABS_MAX_CONCURRENCY", 8)))
+ELEVENLABS_CHUNK_SIZE = 64 * 1024
+
+# Retry rate-limited and transient server errors with exponential backoff
+ELEVENLABS_MAX_RETRIES = 3
+ELEVENLABS_RETRY_BACKOFF = 0.5  # seconds, doubled after each attempt
+ELEVENLABS_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# ElevenLabs synthesis settings
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
+ELEVENLABS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75
+}
+
+# Parallel per-language mixing: half the cores, two ffmpeg threads each
+MIX_MAX_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+MIX_THREADS_PER_PROCESS = 2
+
+# Both amix inputs are converted to this format before mixing, and the
+# result is encoded at this bitrate
+MIX_SAMPLE_RATE = 44100
+MIX_AUDIO_BITRATE = '128k'
+
+# Generated voiceovers shared across sessions, keyed by content hash. Voiceovers
+# unused for TTS_CACHE_TTL are deleted, then the least recently used ones until
+# the cache fits in TTS_CACHE_MAX_BYTES.
+TTS_CACHE_DIR = Path("temp_files/tts_cache")
+TTS_CACHE_TTL = 30 * 24 * 3600  # seconds
+TTS_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Minimum time between sweeps of a disk cache directory
+CACHE_PRUNE_INTERVAL = 3600  # seconds
+_cache_pruned_at = {}
+
+# Chunk size for copying videos into the download ZIP
+ZIP_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Characters replaced with underscores in generated file names
+UNSAFE_NAME_RE = re.compile(r'[^a-zA-Z0-9]')
 
 # Voice options
 VOICES = {
@@ -60,6 +135,9 @@ VOICES = {
     "3": {"name": "Chris", "id": "iP95p4xoKVk53GoZ742B"}
 }
 
+# Voice names by ElevenLabs voice id, used in output file names
+VOICE_ID_TO_NAME = {v["id"]: v["name"] for v in VOICES.values()}
+
 # Language codes and names
 LANGUAGES = {
     "JP": "Japanese",
@@ -81,6 +159,38 @@ LANGUAGES = {
     "TH": "Thai"
 }
 
+# Navigation tools are static, so resolve them once at startup
+ACTIVE_TOOLS = get_active_tools()
+
+# Language-specific translation instructions
+LANGUAGE_INSTRUCTIONS = {
+    "Japanese": " Use appropriate honorifics (敬語) and particles.",
+    "Korean": " Use appropriate speech levels (존댓말/반말) and honorifics.",
+    "Chinese": " Use appropriate measure words and consider regional variations.",
+    "Arabic": " Use appropriate formality levels and consider regional dialects.",
+    "Hindi": " Use appropriate formality levels and consider regional variations.",
+    "Thai": " Use appropriate politeness particles and consider social context."
+}
+
+CREATIVE_LANGUAGE_INSTRUCTIONS = {
+    "Japanese": """ Use slang and casual expressions popular among Japanese natives. Incorporate uniquely Japanese expressions (like わかる！, マジ?, なるほど) and cultural references that would be instantly recognized by locals. Adjust the rhythm to match natural Japanese speech patterns.""",
+    "Korean": """ Use trendy Korean expressions and internet slang popular with locals. Incorporate Korean-specific emotional expressions and reaction phrases. Consider using some Konglish (Korean-English hybrid words) where appropriate as natives would.""",
+    "Chinese": """ Use region-specific internet slang and expressions that are trending in Chinese social media. Adapt rhythm to match natural Chinese speech patterns. Consider incorporating popular sayings, internet catchphrases (网络热词), and expressions that are uniquely Chinese.""",
+    "Spanish": """ Use country-specific slang and expressions based on the target region (Spain vs Latin America). Incorporate local humor styles, informal contractions, and region-specific idioms that would immediately feel familiar to natives.""",
+    "French": """ Use contemporary French expressions and slang (argot) that natives use in casual conversation. Incorporate cultural references specific to French society and adjust rhythm to match natural French cadence.""",
+    "German": """ Use modern German colloquialisms and expressions popular in daily speech. Consider regional variations and incorporate popular German sayings and expressions that would resonate with local audiences.""",
+    "Hindi": """ Use Hinglish (Hindi-English mix) where appropriate as it's common in everyday speech. Incorporate popular Bollywood references or trending expressions from Indian social media that would immediately connect with local audiences.""",
+    "Arabic": """ Adapt to regional Arabic dialect expressions rather than formal MSA where appropriate. Use culturally specific greetings and expressions that vary by region, incorporating local cultural references that would resonate deeply.""",
+    "Vietnamese": """ Use contemporary Vietnamese slang and expressions popular among natives. Incorporate trending phrases from Vietnamese social media and adjust rhythm to match natural Vietnamese speech patterns.""",
+    "Thai": """ Use Thai-specific expressions and slang words popular in everyday conversations. Consider incorporating playful particles and ending words that Thai speakers naturally use to express emotions and attitudes."""
+}
+
+def get_language_instructions(target_language, mode="faithful"):
+    """Get the extra instructions for a language in the given mode"""
+    instructions = CREATIVE_LANGUAGE_INSTRUCTIONS if mode == "creative" else LANGUAGE_INSTRUCTIONS
+    return instructions.get(target_language, "")
+
+@lru_cache(maxsize=64)
 def get_enhanced_system_message(target_language, mode="faithful"):
     """Get enhanced system message for more localized translations"""
     if mode == "faithful":
@@ -111,92 +221,391 @@ Important: The translation should read fluidly in {target_language}, feel cultur
 
 Important: The translation should sound completely authentic to native speakers, as if it was originally conceived in their language and culture - NOT like a translation at all. Use expressions only locals would know and appreciate."""
     
-    # Add language-specific instructions
-    language_specific = {
-        "Japanese": " Use appropriate honorifics (敬語) and particles.",
-        "Korean": " Use appropriate speech levels (존댓말/반말) and honorifics.",
-        "Chinese": " Use appropriate measure words and consider regional variations.",
-        "Arabic": " Use appropriate formality levels and consider regional dialects.",
-        "Hindi": " Use appropriate formality levels and consider regional variations.",
-        "Thai": " Use appropriate politeness particles and consider social context."
-    }
+    return base_message + get_language_instructions(target_language, mode)
+
+def get_batch_system_message(lang_codes, mode="faithful"):
+    """Get system message for translating into several languages in one request"""
+    # Built separately from get_enhanced_system_message, whose plain-text-only
+    # output rule would contradict the JSON response format
+    if mode == "faithful":
+        message = """You are a professional translator and localization expert, specializing in video scripts and voiceovers. Follow these guidelines carefully:
+
+1. Translate the text super naturally, as a native speaker from each target region would.
+2. Adapt idioms, expressions, and cultural references to suit each local audience authentically.
+3. Use appropriate tone and formality for the cultural and situational context.
+4. Keep brand names, product names, and proper nouns in English.
+5. Keep each translation concise and natural-sounding to avoid significantly longer delivery times than the original.
+6. Write each translation as a single, continuous paragraph—no line breaks or multiple paragraphs."""
+    else:
+        message = """You are a creative translator and cultural expert who specializes in highly engaging, localized content. Your goal is to make each translation sound EXTREMELY NATIVE, as if originally created by a local for locals. Follow these guidelines:
+
+1. Focus on capturing the core message and emotional impact rather than literal translation.
+2. Use popular slang, colloquial expressions, and regional phrases that are currently trendy in each target region.
+3. Transform cultural references to local equivalents that will resonate deeply with native speakers.
+4. Maintain the hook/key message of the first sentence, but feel free to creatively adapt the rest.
+5. Keep brand names in English but adapt surrounding language to sound natural.
+6. Write each translation as a single paragraph, with a length SIMILAR to the original text."""
     
-    creative_language_specific = {
-        "Japanese": """ Use slang and casual expressions popular among Japanese natives. Incorporate uniquely Japanese expressions (like わかる！, マジ?, なるほど) and cultural references that would be instantly recognized by locals. Adjust the rhythm to match natural Japanese speech patterns.""",
-        "Korean": """ Use trendy Korean expressions and internet slang popular with locals. Incorporate Korean-specific emotional expressions and reaction phrases. Consider using some Konglish (Korean-English hybrid words) where appropriate as natives would.""",
-        "Chinese": """ Use region-specific internet slang and expressions that are trending in Chinese social media. Adapt rhythm to match natural Chinese speech patterns. Consider incorporating popular sayings, internet catchphrases (网络热词), and expressions that are uniquely Chinese.""",
-        "Spanish": """ Use country-specific slang and expressions based on the target region (Spain vs Latin America). Incorporate local humor styles, informal contractions, and region-specific idioms that would immediately feel familiar to natives.""",
-        "French": """ Use contemporary French expressions and slang (argot) that natives use in casual conversation. Incorporate cultural references specific to French society and adjust rhythm to match natural French cadence.""",
-        "German": """ Use modern German colloquialisms and expressions popular in daily speech. Consider regional variations and incorporate popular German sayings and expressions that would resonate with local audiences.""",
-        "Hindi": """ Use Hinglish (Hindi-English mix) where appropriate as it's common in everyday speech. Incorporate popular Bollywood references or trending expressions from Indian social media that would immediately connect with local audiences.""",
-        "Arabic": """ Adapt to regional Arabic dialect expressions rather than formal MSA where appropriate. Use culturally specific greetings and expressions that vary by region, incorporating local cultural references that would resonate deeply.""",
-        "Vietnamese": """ Use contemporary Vietnamese slang and expressions popular among natives. Incorporate trending phrases from Vietnamese social media and adjust rhythm to match natural Vietnamese speech patterns.""",
-        "Thai": """ Use Thai-specific expressions and slang words popular in everyday conversations. Consider incorporating playful particles and ending words that Thai speakers naturally use to express emotions and attitudes."""
-    }
+    message += "\n\nTranslate the text into each of these target languages:"
+    for lang_code in lang_codes:
+        lang_name = LANGUAGES[lang_code]
+        message += f"\n- {lang_code} ({lang_name}):{get_language_instructions(lang_name, mode)}"
+    message += "\n\nRespond with a JSON object whose keys are the language codes above and whose values are the translations."
+    return message
+
+def prune_cache_dir(directory, max_age, max_bytes=None):
+    """Delete cache files unused for max_age, then the least recently used until under max_bytes"""
+    # Cache hits touch their file, so mtime is the time of last use
+    try:
+        now = time.time()
+        entries = []
+        for path in directory.iterdir():
+            try:
+                stat = path.stat()
+                if now - stat.st_mtime > max_age:
+                    path.unlink()
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+        
+        if max_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+    except Exception as e:
+        logging.warning(f"Error pruning cache {directory}: {str(e)}")
+
+def maybe_prune_cache_dir(directory, max_age, max_bytes=None):
+    """Prune a cache directory if it hasn't been swept in the last CACHE_PRUNE_INTERVAL"""
+    now = time.monotonic()
+    last_pruned = _cache_pruned_at.get(directory)
+    if last_pruned is not None and now - last_pruned < CACHE_PRUNE_INTERVAL:
+        return
+    _cache_pruned_at[directory] = now
+    prune_cache_dir(directory, max_age, max_bytes)
+
+def get_translation_cache_path(text, lang_code, mode):
+    """Get the on-disk cache path for a translation"""
+    key = hashlib.sha256(f"{TRANSLATION_MODEL}|{mode}|{lang_code}|{text}".encode()).hexdigest()
+    return TRANSLATION_CACHE_DIR / f"tr_{key}.txt"
+
+def remember_translation(key, translation):
+    """Store a translation in the in-process cache, evicting the least recently used"""
+    with _translation_cache_lock:
+        _translation_cache[key] = (time.time(), translation)
+        _translation_cache.move_to_end(key)
+        while len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+            _translation_cache.popitem(last=False)
+
+def get_cached_translation(text, lang_code, mode):
+    """Get a translation from the in-process cache, falling back to disk"""
+    key = (text, lang_code, mode)
+    with _translation_cache_lock:
+        entry = _translation_cache.get(key)
+        if entry is not None:
+            cached_at, translation = entry
+            if time.time() - cached_at <= TRANSLATION_CACHE_TTL:
+                _translation_cache.move_to_end(key)
+                return translation
+            del _translation_cache[key]
     
-    message = base_message
+    cache_path = get_translation_cache_path(text, lang_code, mode)
+    try:
+        if time.time() - cache_path.stat().st_mtime > TRANSLATION_CACHE_TTL:
+            cache_path.unlink(missing_ok=True)
+            return None
+        translation = cache_path.read_text(encoding="utf-8")
+        os.utime(cache_path)  # Mark as recently used for pruning
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Error reading cached translation: {str(e)}")
+        return None
     
-    if mode == "faithful" and target_language in language_specific:
-        message += language_specific[target_language]
-    elif mode == "creative" and target_language in creative_language_specific:
-        message += creative_language_specific[target_language]
+    remember_translation(key, translation)
+    return translation
+
+def cache_translation(text, lang_code, mode, translation):
+    """Store a translation in memory and on disk"""
+    remember_translation((text, lang_code, mode), translation)
     
-    return message
+    try:
+        cache_path = get_translation_cache_path(text, lang_code, mode)
+        # Write to a temporary name first so readers never see a partial file
+        temp_path = cache_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        temp_path.write_text(translation, encoding="utf-8")
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        logging.warning(f"Error caching translation: {str(e)}")
+    
+    maybe_prune_cache_dir(TRANSLATION_CACHE_DIR, TRANSLATION_CACHE_TTL, TRANSLATION_DISK_CACHE_MAX_BYTES)
 
-def translate_text(text, target_language, translation_mode="faithful"):
-    """Translation using OpenAI"""
+def translate_batch(text, lang_codes, translation_mode="faithful"):
+    """Translate text into all languages with a single OpenAI request"""
+    if not lang_codes:
+        return {}
+    
     try:
-        system_message = get_enhanced_system_message(target_language, translation_mode)
+        system_message = get_batch_system_message(lang_codes, translation_mode)
         response = openai_client.chat.completions.create(
-            model="gpt-4o",
+            model=TRANSLATION_MODEL,
+            response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": system_message},
                 {"role": "user", "content": text}
             ],
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=min(TRANSLATION_MAX_TOKENS * len(lang_codes), 16000)
         )
+        result = json.loads(response.choices[0].message.content)
+        return {
+            lang_code: result[lang_code].strip()
+            for lang_code in lang_codes
+            if isinstance(result.get(lang_code), str) and result[lang_code].strip()
+        }
+    except Exception as e:
+        logging.error(f"Error in batch translation: {str(e)}")
+        return {}
+
+def submit_translation_batch(text, lang_codes, translation_mode="faithful"):
+    """Submit translations to the OpenAI Batch API (half price, completes within 24h)"""
+    requests_jsonl = "\n".join(
+        json.dumps({
+            "custom_id": lang_code,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": TRANSLATION_MODEL,
+                "messages": [
+                    {"role": "system", "content": get_enhanced_system_message(LANGUAGES[lang_code], translation_mode)},
+                    {"role": "user", "content": text}
+                ],
+                "temperature": 0.3,
+                "max_tokens": TRANSLATION_MAX_TOKENS
+            }
+        })
+        for lang_code in lang_codes
+    )
+    
+    batch_file = openai_client.files.create(
+        file=("translations.jsonl", requests_jsonl.encode("utf-8")),
+        purpose="batch"
+    )
+    batch = openai_client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return batch.id
+
+def fetch_translation_batch(batch_id):
+    """Get a translation batch's status, plus its translations once completed"""
+    batch = openai_client.batches.retrieve(batch_id)
+    if batch.status != "completed" or not batch.output_file_id:
+        return batch.status, {}
+    
+    translations = {}
+    output = openai_client.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            logging.error(f"Batch translation failed for {result.get('custom_id')}: {result.get('error')}")
+            continue
+        translation = response["body"]["choices"][0]["message"]["content"].strip()
+        if translation:
+            translations[result["custom_id"]] = translation
+    return batch.status, translations
+
+async def translate_text_async(client, semaphore, text, target_language, translation_mode="faithful"):
+    """Translation using OpenAI (async)"""
+    try:
+        system_message = get_enhanced_system_message(target_language, translation_mode)
+        async with semaphore:
+            response = await client.chat.completions.create(
+                model=TRANSLATION_MODEL,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": text}
+                ],
+                temperature=0.3,
+                max_tokens=TRANSLATION_MAX_TOKENS
+            )
         return response.choices[0].message.content.strip()
     except Exception as e:
         logging.error(f"Error translating to {target_language}: {str(e)}")
         return None
 
-def generate_elevenlabs_voice(text, language_code, output_directory, english_identifier, voice_id):
-    """Generate voice using ElevenLabs API"""
+async def translate_all(text, lang_codes, translation_mode="faithful"):
+    """Translate text into all languages concurrently"""
+    semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    # aiohttp transport avoids httpx's throughput collapse under concurrent requests
+    async with AsyncOpenAI(
+        api_key=openai_api_key, max_retries=OPENAI_MAX_RETRIES, http_client=DefaultAioHttpClient()
+    ) as client:
+        results = await asyncio.gather(
+            *[translate_text_async(client, semaphore, text, LANGUAGES[code], translation_mode) for code in lang_codes],
+            return_exceptions=True
+        )
+    
+    translations = {}
+    for lang_code, result in zip(lang_codes, results):
+        if isinstance(result, Exception):
+            logging.error(f"Error translating to {lang_code}: {str(result)}")
+        elif result:
+            translations[lang_code] = result
+    return translations
+
+def get_cached_translations(text, lang_codes, translation_mode="faithful"):
+    """Get the cached translations of text for the given languages"""
+    translations = {}
+    for lang_code in lang_codes:
+        cached = get_cached_translation(text, lang_code, translation_mode)
+        if cached is not None:
+            translations[lang_code] = cached
+    return translations
+
+def translate_languages(text, lang_codes, translation_mode="faithful"):
+    """Translate text into the given languages, reusing cached translations"""
+    ensure_dir(TRANSLATION_CACHE_DIR)
+    translations = {}
+    # Single-request translations come from a different prompt, so they are
+    # cached under their own mode and never served to the per-language path
+    single_request_mode = f"{translation_mode}-single"
+    for lang_code in lang_codes:
+        cached = get_cached_translation(text, lang_code, translation_mode)
+        if cached is None and TRANSLATION_SINGLE_REQUEST:
+            cached = get_cached_translation(text, lang_code, single_request_mode)
+        if cached is not None:
+            translations[lang_code] = cached
+    
+    # Translate uncached languages concurrently, one request each, unless the
+    # single-request mode is enabled; anything it misses is translated individually
+    uncached = [lang_code for lang_code in lang_codes if lang_code not in translations]
+    if uncached:
+        if TRANSLATION_SINGLE_REQUEST:
+            batch_translations = translate_batch(text, uncached, translation_mode)
+            for lang_code, translation in batch_translations.items():
+                cache_translation(text, lang_code, single_request_mode, translation)
+            translations.update(batch_translations)
+        
+        missing = [lang_code for lang_code in uncached if lang_code not in translations]
+        if missing:
+            if TRANSLATION_SINGLE_REQUEST:
+                logging.info(f"Falling back to per-language translation for: {', '.join(missing)}")
+            new_translations = run_async(translate_all(text, missing, translation_mode))
+            for lang_code, translation in new_translations.items():
+                cache_translation(text, lang_code, translation_mode, translation)
+            translations.update(new_translations)
+    
+    return {
+        lang_code: translations[lang_code]
+        for lang_code in lang_codes
+        if lang_code in translations
+    }
+
+def get_tts_cache_path(text, voice_id):
+    """Get the cache path for a voiceover of text spoken by voice_id"""
+    settings = "|".join(str(v) for v in ELEVENLABS_VOICE_SETTINGS.values())
+    key = hashlib.sha256(f"{voice_id}|{text}|{ELEVENLABS_MODEL_ID}|{settings}".encode()).hexdigest()
+    return TTS_CACHE_DIR / f"{key}.mp3"
+
+def store_tts_cache(audio_file, cache_path):
+    """Copy a generated voiceover into the cache"""
     try:
-        voice_name = next((v["name"] for v in VOICES.values() if v["id"] == voice_id), "Unknown")
+        # Copy to a temporary name first so readers never see a partial file
+        temp_path = cache_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        shutil.copyfile(audio_file, temp_path)
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        logging.warning(f"Error caching voiceover: {str(e)}")
+    
+    maybe_prune_cache_dir(TTS_CACHE_DIR, TTS_CACHE_TTL, TTS_CACHE_MAX_BYTES)
+
+def copy_cached_voiceover(cache_path, output_file):
+    """Copy a cached voiceover to output_file, marking it as recently used"""
+    shutil.copyfile(cache_path, output_file)
+    os.utime(cache_path)
+
+async def generate_elevenlabs_voice_async(http_session, text, language_code, output_directory, english_identifier, voice_id):
+    """Generate voice using ElevenLabs API (async)"""
+    try:
+        voice_name = VOICE_ID_TO_NAME.get(voice_id, "Unknown")
         safe_name = f"{voice_name}_{language_code}_{english_identifier}"
         output_file = f"{output_directory}/{safe_name}.mp3"
         
         url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": elevenlabs_api_key
-        }
-        
         data = {
             "text": text,
-            "model_id": "eleven_multilingual_v2",
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.75
-            }
+            "model_id": ELEVENLABS_MODEL_ID,
+            "voice_settings": ELEVENLABS_VOICE_SETTINGS
         }
         
-        response = requests.post(url, json=data, headers=headers)
-        
-        if response.status_code == 200:
-            with open(output_file, "wb") as f:
-                f.write(response.content)
-            return output_file
-        else:
-            logging.error(f"Error from ElevenLabs API: {response.status_code} - {response.text}")
-            return None
+        # Reuse a previously generated voiceover for identical input
+        cache_path = get_tts_cache_path(text, voice_id)
+        if cache_path.exists():
+            # Whole-file copies go to a worker thread in one hop so they don't block the loop
+            try:
+                await asyncio.to_thread(copy_cached_voiceover, cache_path, output_file)
+                return output_file
+            except FileNotFoundError:
+                # Evicted by a cache sweep since the check, so synthesize it again
+                logging.info(f"Cached voiceover for {language_code} was pruned, regenerating")
+        
+        for attempt in range(ELEVENLABS_MAX_RETRIES + 1):
+            async with http_session.post(url, json=data) as response:
+                if response.status == 200:
+                    # Stream the mp3 to disk instead of buffering it in memory
+                    async with aiofiles.open(output_file, "wb") as f:
+                        async for chunk in response.content.iter_chunked(ELEVENLABS_CHUNK_SIZE):
+                            await f.write(chunk)
+                    await asyncio.to_thread(store_tts_cache, output_file, cache_path)
+                    return output_file
+                elif response.status in ELEVENLABS_RETRY_STATUSES and attempt < ELEVENLABS_MAX_RETRIES:
+                    logging.warning(f"ElevenLabs API returned {response.status} for {language_code}, retrying")
+                else:
+                    logging.error(f"Error from ElevenLabs API: {response.status} - {await response.text()}")
+                    return None
+            # Back off before retrying rate-limited or failed requests
+            await asyncio.sleep(ELEVENLABS_RETRY_BACKOFF * 2 ** attempt)
     except Exception as e:
         logging.error(f"Error generating voice: {str(e)}")
         return None
 
+async def generate_all_voices(translations, output_directory, english_identifier, voice_id):
+    """Generate voiceovers for all translations concurrently"""
+    ensure_dir(TTS_CACHE_DIR)
+    connector = aiohttp.TCPConnector(limit=ELEVENLABS_MAX_CONCURRENCY)
+    headers = {
+        "Accept": "audio/mpeg",
+        "xi-api-key": elevenlabs_api_key
+    }
+    async def generate(lang_code, translation):
+        output_file = await generate_elevenlabs_voice_async(
+            http_session, translation, lang_code, output_directory, english_identifier, voice_id
+        )
+        return lang_code, output_file
+    
+    generated = {}
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as http_session:
+        pending = [generate(lang_code, translation) for lang_code, translation in translations.items()]
+        # Report each language as soon as its voiceover is ready
+        for done, next_completed in enumerate(asyncio.as_completed(pending), start=1):
+            lang_code, output_file = await next_completed
+            if output_file:
+                generated[lang_code] = output_file
+                logging.info(f"Voiceover ready for {lang_code} ({done}/{len(pending)})")
+            else:
+                logging.warning(f"Voiceover failed for {lang_code} ({done}/{len(pending)})")
+    
+    return {lang_code: generated[lang_code] for lang_code in translations if lang_code in generated}
+
 def separate_vocals_demucs(audio_file, output_dir):
     """Separate vocals from audio using Demucs"""
     try:
@@ -284,7 +693,7 @@ def remove_vocals_from_video(video_path, output_directory):
             str(instrumental_video_path),
             acodec='aac',
             vcodec='copy'
-        ).overwrite_output().run(capture_stdout=True, capture_stderr=True)
+        ).overwrite_output().run(capture_stderr=True)
         
         # Clean up temporary audio
         try:
@@ -298,28 +707,44 @@ def remove_vocals_from_video(video_path, output_directory):
         logging.error(f"Error removing vocals from video: {str(e)}")
         return None
 
+def normalize_mix_input(audio):
+    """Convert an amix input to the common mix format up front"""
+    return ffmpeg.filter(audio, 'aformat', sample_rates=MIX_SAMPLE_RATE, channel_layouts='stereo')
+
+def build_mix_output(video, original_audio, audio_file, output_file, voiceover_volume, **output_args):
+    """Build the ffmpeg output that lays a voiceover over the video"""
+    audio = ffmpeg.input(str(audio_file))
+    mixed_audio = ffmpeg.filter([
+        original_audio,
+        normalize_mix_input(ffmpeg.filter(audio, 'volume', voiceover_volume))
+    ], 'amix', inputs=2, duration='first')
+    
+    return ffmpeg.output(
+        video.video,
+        mixed_audio,
+        str(output_file),
+        acodec='aac',
+        aac_coder='fast',
+        audio_bitrate=MIX_AUDIO_BITRATE,
+        vcodec='copy',
+        **output_args
+    )
+
 def mix_audio_with_video(audio_file, video_file, output_file, original_volume=0.8, voiceover_volume=1.3, use_instrumental=False):
     """Mix audio with video using ffmpeg-python"""
     try:
         video = ffmpeg.input(str(video_file))
-        audio = ffmpeg.input(str(audio_file))
         
         # If using instrumental version, we don't need to lower the original volume as much
         if use_instrumental:
             original_volume = min(original_volume * 1.5, 1.0)  # Boost instrumental audio a bit
         
-        mixed_audio = ffmpeg.filter([
-            ffmpeg.filter(video.audio, 'volume', original_volume),
-            ffmpeg.filter(audio, 'volume', voiceover_volume)
-        ], 'amix', inputs=2, duration='first')
+        original_audio = normalize_mix_input(ffmpeg.filter(video.audio, 'volume', original_volume))
         
-        ffmpeg.output(
-            video.video,
-            mixed_audio,
-            str(output_file),
-            acodec='aac',
-            vcodec='copy'
-        ).overwrite_output().run(capture_stdout=True, capture_stderr=True)
+        build_mix_output(
+            video, original_audio, audio_file, output_file, voiceover_volume,
+            threads=MIX_THREADS_PER_PROCESS
+        ).overwrite_output().run(capture_stderr=True)
         
         return True
     except ffmpeg.Error as e:
@@ -329,6 +754,113 @@ def mix_audio_with_video(audio_file, video_file, output_file, original_volume=0.
         logging.error(f"Error in audio mixing: {str(e)}")
         return False
 
+def mix_all_audio_with_video(jobs, video_file, original_volume=0.8, voiceover_volume=1.3, use_instrumental=False):
+    """Mix every language's voiceover with the video in a single ffmpeg run"""
+    # jobs maps language code to (audio_file, output_file); the video is demuxed
+    # once and its stream copied into every output
+    try:
+        video = ffmpeg.input(str(video_file))
+        
+        if use_instrumental:
+            original_volume = min(original_volume * 1.5, 1.0)  # Boost instrumental audio a bit
+        
+        original_audio = normalize_mix_input(
+            ffmpeg.filter(video.audio, 'volume', original_volume)
+        ).filter_multi_output('asplit', len(jobs))
+        
+        outputs = [
+            build_mix_output(video, original_audio[i], audio_file, output_file, voiceover_volume)
+            for i, (audio_file, output_file) in enumerate(jobs.values())
+        ]
+        
+        ffmpeg.merge_outputs(*outputs).overwrite_output().run(capture_stderr=True)
+        return True
+    except ffmpeg.Error as e:
+        logging.error(f"Error in audio mixing: {e.stderr.decode() if e.stderr else str(e)}")
+        return False
+    except Exception as e:
+        logging.error(f"Error in audio mixing: {str(e)}")
+        return False
+
+def mix_audio_with_video_parallel(jobs, video_file, original_volume=0.8, voiceover_volume=1.3, use_instrumental=False):
+    """Mix each language in its own ffmpeg process, running them in parallel"""
+    mixed_videos = {}
+    with ThreadPoolExecutor(max_workers=min(len(jobs), MIX_MAX_WORKERS)) as executor:
+        futures = {
+            lang_code: (output_file, executor.submit(
+                mix_audio_with_video, audio_file, video_file, output_file,
+                original_volume, voiceover_volume, use_instrumental
+            ))
+            for lang_code, (audio_file, output_file) in jobs.items()
+        }
+        
+        for lang_code, (output_file, future) in futures.items():
+            if future.result():
+                mixed_videos[lang_code] = output_file
+    return mixed_videos
+
+async def localize_all(text, lang_codes, translation_mode, voice_id, audio_dir, jobs, video_file,
+                       original_volume=0.8, voiceover_volume=1.3, use_instrumental=False):
+    """Translate, voice and mix every language, each language moving on as soon as its previous step is done"""
+    # jobs maps language code to its output video; returns translations, audio files and mixed videos
+    ensure_dir(TRANSLATION_CACHE_DIR)
+    ensure_dir(TTS_CACHE_DIR)
+    english_identifier = UNSAFE_NAME_RE.sub('_', text[:20])
+    openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    mix_semaphore = asyncio.Semaphore(MIX_MAX_WORKERS)
+    connector = aiohttp.TCPConnector(limit=ELEVENLABS_MAX_CONCURRENCY)
+    headers = {
+        "Accept": "audio/mpeg",
+        "xi-api-key": elevenlabs_api_key
+    }
+    
+    async def localize(lang_code):
+        # Cache lookups and stores touch the disk, so keep them off the event loop
+        translation = await asyncio.to_thread(get_cached_translation, text, lang_code, translation_mode)
+        if translation is None:
+            translation = await translate_text_async(
+                client, openai_semaphore, text, LANGUAGES[lang_code], translation_mode
+            )
+            if not translation:
+                return lang_code, None, None, None
+            await asyncio.to_thread(cache_translation, text, lang_code, translation_mode, translation)
+        
+        audio_file = await generate_elevenlabs_voice_async(
+            http_session, translation, lang_code, audio_dir, english_identifier, voice_id
+        )
+        if not audio_file:
+            return lang_code, translation, None, None
+        
+        # Cap concurrent ffmpeg processes; each already runs several threads
+        async with mix_semaphore:
+            mixed = await asyncio.to_thread(
+                mix_audio_with_video, audio_file, video_file, jobs[lang_code],
+                original_volume, voiceover_volume, use_instrumental
+            )
+        return lang_code, translation, audio_file, jobs[lang_code] if mixed else None
+    
+    translations, audio_files, mixed_videos = {}, {}, {}
+    async with (
+        AsyncOpenAI(api_key=openai_api_key, max_retries=OPENAI_MAX_RETRIES, http_client=DefaultAioHttpClient()) as client,
+        aiohttp.ClientSession(connector=connector, headers=headers) as http_session
+    ):
+        pending = [localize(lang_code) for lang_code in lang_codes]
+        for done, next_completed in enumerate(asyncio.as_completed(pending), start=1):
+            lang_code, translation, audio_file, output_file = await next_completed
+            if translation:
+                translations[lang_code] = translation
+            if audio_file:
+                audio_files[lang_code] = audio_file
+            if output_file:
+                mixed_videos[lang_code] = output_file
+                logging.info(f"Video ready for {lang_code} ({done}/{len(pending)})")
+            else:
+                logging.warning(f"Localization failed for {lang_code} ({done}/{len(pending)})")
+    
+    def in_order(results):
+        return {lang_code: results[lang_code] for lang_code in lang_codes if lang_code in results}
+    return in_order(translations), in_order(audio_files), in_order(mixed_videos)
+
 def extract_audio_from_video(video_path, output_audio_path):
     """Extract audio from video using ffmpeg"""
     try:
@@ -337,7 +869,7 @@ def extract_audio_from_video(video_path, output_audio_path):
             .input(str(video_path))
             .output(str(output_audio_path), acodec='pcm_s16le', ac=1, ar='16000')
             .overwrite_output()
-            .run(capture_stdout=True, capture_stderr=True)
+            .run(capture_stderr=True)
         )
         return True
     except ffmpeg.Error as e:
@@ -347,16 +879,34 @@ def extract_audio_from_video(video_path, output_audio_path):
         logging.error(f"Error extracting audio: {str(e)}")
         return False
 
-def transcribe_audio(audio_file_path):
+def extract_audio_to_buffer(video_path):
+    """Extract audio from video into an in-memory Ogg/Opus file"""
+    try:
+        audio_data, _ = (
+            ffmpeg
+            .input(str(video_path))
+            .output('pipe:', format='ogg', acodec='libopus', ac=1, ar='16000')
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+        audio_buffer = io.BytesIO(audio_data)
+        audio_buffer.name = "audio.ogg"  # Lets the API infer the format
+        return audio_buffer
+    except ffmpeg.Error as e:
+        logging.error(f"Error extracting audio: {e.stderr.decode() if e.stderr else str(e)}")
+        return None
+    except Exception as e:
+        logging.error(f"Error extracting audio: {str(e)}")
+        return None
+
+def transcribe_audio(audio_file):
     """Transcribe audio using OpenAI Whisper"""
     try:
-        with open(audio_file_path, "rb") as audio_file:
-            transcription = openai_client.audio.transcriptions.create(
-                file=audio_file,
-                model="whisper-1",
-                response_format="text",
-                prompt="This is a marketing video or advertisement. Please transcribe accurately."
-            )
+        transcription = openai_client.audio.transcriptions.create(
+            file=audio_file,
+            model="whisper-1",
+            response_format="text",
+            prompt="This is a marketing video or advertisement. Please transcribe accurately."
+        )
         return transcription
     except Exception as e:
         logging.error(f"Error transcribing audio: {str(e)}")
@@ -365,37 +915,68 @@ def transcribe_audio(audio_file_path):
 def transcribe_video(video_file_path):
     """Complete transcription workflow for video file"""
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        temp_dir = Path("temp_transcription")
-        temp_dir.mkdir(exist_ok=True)
-        
-        temp_audio_path = temp_dir / f"temp_audio_{timestamp}.wav"
-        
-        if not extract_audio_from_video(video_file_path, temp_audio_path):
+        # Audio goes straight from ffmpeg to Whisper without touching disk
+        audio_buffer = extract_audio_to_buffer(video_file_path)
+        if audio_buffer is None:
             return None
         
-        transcription = transcribe_audio(temp_audio_path)
-        
-        # Clean up temporary files
-        try:
-            os.remove(temp_audio_path)
-            if temp_dir.exists() and not any(temp_dir.iterdir()):
-                temp_dir.rmdir()
-        except Exception as e:
-            logging.warning(f"Error cleaning up temp files: {str(e)}")
-        
-        return transcription
+        return transcribe_audio(audio_buffer)
         
     except Exception as e:
         logging.error(f"Error in transcribe_video function: {str(e)}")
         return None
 
+class ZipStreamBuffer:
+    """Write-only file object that hands zipfile output back in chunks"""
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def stream_zip(file_paths):
+    """Yield a ZIP of file_paths piece by piece as it is written"""
+    # The buffer can't seek, so zipfile writes sizes after each entry's data
+    buffer = ZipStreamBuffer()
+    # mp4s are already compressed, so store them without deflating
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zip_file:
+        for file_path in file_paths:
+            zip_info = zipfile.ZipInfo.from_file(file_path, os.path.basename(file_path))
+            with open(file_path, 'rb') as src, zip_file.open(zip_info, 'w') as dest:
+                for chunk in iter(lambda: src.read(ZIP_COPY_CHUNK_SIZE), b''):
+                    dest.write(chunk)
+                    yield buffer.drain()
+    yield buffer.drain()
+
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+def ensure_dir(directory):
+    """Create a directory if it doesn't exist yet"""
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+def get_session_dir(name):
+    """Get a working directory for the current session, creating it if needed"""
+    session_id = session.get('session_id', str(uuid.uuid4()))
+    session['session_id'] = session_id
+    return ensure_dir(Path("temp_files") / session_id / name)
+
 @app.route('/')
 def index():
-    from tools_config import TOOLS_CONFIG
-    tools = get_active_tools()
-    return render_template('index.html', languages=LANGUAGES, voices=VOICES, tools=tools, tools_config=TOOLS_CONFIG)
+    return render_template('index.html', languages=LANGUAGES, voices=VOICES, tools=ACTIVE_TOOLS, tools_config=TOOLS_CONFIG)
 
 @app.route('/api/translate', methods=['POST'])
 def translate():
@@ -404,23 +985,75 @@ def translate():
         text = data.get('text', '').strip()
         languages = data.get('languages', [])
         translation_mode = data.get('translation_mode', 'faithful')
+        use_batch = data.get('batch', False)
         
         if not text or not languages:
             return jsonify({'error': 'Text and languages are required'}), 400
         
-        translations = {}
-        for lang_code in languages:
-            if lang_code in LANGUAGES:
-                lang_name = LANGUAGES[lang_code]
-                translation = translate_text(text, lang_name, translation_mode)
-                if translation:
-                    translations[lang_code] = translation
+        # Normalize so equivalent input hits the same cache entries (ASCII is already NFC)
+        if not text.isascii():
+            text = unicodedata.normalize("NFC", text)
+        
+        lang_codes = [lang_code for lang_code in languages if lang_code in LANGUAGES]
+        if not lang_codes:
+            return jsonify({'error': 'No supported languages selected'}), 400
+        
+        # Batch mode queues the uncached languages with OpenAI; results are fetched later
+        if use_batch:
+            ensure_dir(TRANSLATION_CACHE_DIR)
+            cached = get_cached_translations(text, lang_codes, translation_mode)
+            uncached = [lang_code for lang_code in lang_codes if lang_code not in cached]
+            if not uncached:
+                return jsonify({'translations': cached})
+            
+            batch_id = submit_translation_batch(text, uncached, translation_mode)
+            # Cached translations are looked up again once the batch completes,
+            # which keeps them out of the session cookie
+            session['translation_batch'] = {
+                'id': batch_id,
+                'text': text,
+                'mode': translation_mode,
+                'languages': lang_codes
+            }
+            return jsonify({'batch_id': batch_id})
+        
+        translations = translate_languages(text, lang_codes, translation_mode)
         
         return jsonify({'translations': translations})
     except Exception as e:
         logging.error(f"Translation error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/translate-batch')
+def translation_batch_status():
+    try:
+        batch = session.get('translation_batch')
+        if not batch:
+            return jsonify({'error': 'No translation batch submitted'}), 404
+        
+        status, batch_translations = fetch_translation_batch(batch['id'])
+        if status != 'completed':
+            return jsonify({'status': status})
+        
+        text, translation_mode, lang_codes = batch['text'], batch['mode'], batch['languages']
+        ensure_dir(TRANSLATION_CACHE_DIR)
+        for lang_code, translation in batch_translations.items():
+            cache_translation(text, lang_code, translation_mode, translation)
+        
+        translations = get_cached_translations(text, lang_codes, translation_mode)
+        translations.update(batch_translations)
+        return jsonify({
+            'status': status,
+            'translations': {
+                lang_code: translations[lang_code]
+                for lang_code in lang_codes
+                if lang_code in translations
+            }
+        })
+    except Exception as e:
+        logging.error(f"Translation batch error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/generate-voice', methods=['POST'])
 def generate_voice():
     try:
@@ -431,23 +1064,14 @@ def generate_voice():
         if not translations or not voice_id:
             return jsonify({'error': 'Translations and voice_id are required'}), 400
         
-        # Create session-specific directories
-        session_id = session.get('session_id', str(uuid.uuid4()))
-        session['session_id'] = session_id
+        audio_dir = get_session_dir("audio")
         
-        base_dir = Path(f"temp_files/{session_id}")
-        audio_dir = base_dir / "audio"
-        audio_dir.mkdir(parents=True, exist_ok=True)
+        english_identifier = UNSAFE_NAME_RE.sub('_', list(translations.values())[0][:20])
         
-        audio_files = {}
-        english_identifier = re.sub(r'[^a-zA-Z0-9]', '_', list(translations.values())[0][:20])
-        
-        for lang_code, translation in translations.items():
-            output_file = generate_elevenlabs_voice(
-                translation, lang_code, str(audio_dir), english_identifier, voice_id
-            )
-            if output_file:
-                audio_files[lang_code] = output_file
+        # Generate all voiceovers concurrently
+        audio_files = run_async(
+            generate_all_voices(translations, str(audio_dir), english_identifier, voice_id)
+        )
         
         session['audio_files'] = audio_files
         return jsonify({'audio_files': audio_files})
@@ -465,13 +1089,7 @@ def upload_video():
         if video_file.filename == '':
             return jsonify({'error': 'No video file selected'}), 400
         
-        # Create session-specific directories
-        session_id = session.get('session_id', str(uuid.uuid4()))
-        session['session_id'] = session_id
-        
-        base_dir = Path(f"temp_files/{session_id}")
-        video_dir = base_dir / "video"
-        video_dir.mkdir(parents=True, exist_ok=True)
+        video_dir = get_session_dir("video")
         
         # Save video file
         video_path = video_dir / video_file.filename
@@ -501,12 +1119,7 @@ def remove_vocals():
         if not video_path or not os.path.exists(video_path):
             return jsonify({'error': 'No video uploaded. Please upload a video first.'}), 400
         
-        session_id = session.get('session_id', str(uuid.uuid4()))
-        session['session_id'] = session_id
-        
-        base_dir = Path(f"temp_files/{session_id}")
-        vocal_removal_dir = base_dir / "vocal_removal"
-        vocal_removal_dir.mkdir(parents=True, exist_ok=True)
+        vocal_removal_dir = get_session_dir("vocal_removal")
         
         logging.info(f"Processing vocal removal for: {video_path}")
         
@@ -550,20 +1163,21 @@ def mix_audio():
             else:
                 logging.warning("Instrumental version requested but not available, using original")
         
-        # Create export directory
-        session_id = session.get('session_id')
-        base_dir = Path(f"temp_files/{session_id}")
-        export_dir = base_dir / "export"
-        export_dir.mkdir(parents=True, exist_ok=True)
+        export_dir = get_session_dir("export")
         
-        mixed_videos = {}
         video_filename = Path(video_path).name
+        suffix = "_instrumental" if use_vocal_removal else ""
+        jobs = {
+            lang_code: (audio_file, str(export_dir / f"{video_filename.split('.')[0]}_{lang_code}{suffix}.mp4"))
+            for lang_code, audio_file in audio_files.items()
+        }
         
-        for lang_code, audio_file in audio_files.items():
-            suffix = "_instrumental" if use_vocal_removal else ""
-            output_file = export_dir / f"{video_filename.split('.')[0]}_{lang_code}{suffix}.mp4"
-            if mix_audio_with_video(audio_file, video_path, str(output_file), original_volume, voiceover_volume, use_vocal_removal):
-                mixed_videos[lang_code] = str(output_file)
+        # Mix every language in a single ffmpeg pass, falling back to separate mixes if it fails
+        if mix_all_audio_with_video(jobs, video_path, original_volume, voiceover_volume, use_vocal_removal):
+            mixed_videos = {lang_code: output_file for lang_code, (_, output_file) in jobs.items()}
+        else:
+            logging.warning("Single-pass mix failed, mixing languages separately")
+            mixed_videos = mix_audio_with_video_parallel(jobs, video_path, original_volume, voiceover_volume, use_vocal_removal)
         
         session['mixed_videos'] = mixed_videos
         session['used_vocal_removal'] = use_vocal_removal
@@ -572,6 +1186,66 @@ def mix_audio():
         logging.error(f"Audio mixing error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/generate-all', methods=['POST'])
+def generate_all():
+    try:
+        data = request.get_json()
+        text = data.get('text', '').strip()
+        languages = data.get('languages', [])
+        translation_mode = data.get('translation_mode', 'faithful')
+        voice_id = data.get('voice_id')
+        original_volume = data.get('original_volume', 0.8)
+        voiceover_volume = data.get('voiceover_volume', 1.3)
+        use_vocal_removal = data.get('use_vocal_removal', False)
+        
+        video_path = session.get('video_path')
+        
+        if not text or not languages or not voice_id:
+            return jsonify({'error': 'Text, languages and voice_id are required'}), 400
+        if not video_path:
+            return jsonify({'error': 'No video uploaded. Please upload a video first.'}), 400
+        
+        if not text.isascii():
+            text = unicodedata.normalize("NFC", text)
+        
+        # Use instrumental version if available and requested
+        if use_vocal_removal:
+            instrumental_video_path = session.get('instrumental_video_path')
+            if instrumental_video_path and os.path.exists(instrumental_video_path):
+                video_path = instrumental_video_path
+                logging.info("Using instrumental version for mixing")
+            else:
+                logging.warning("Instrumental version requested but not available, using original")
+        
+        audio_dir = get_session_dir("audio")
+        export_dir = get_session_dir("export")
+        
+        lang_codes = [lang_code for lang_code in languages if lang_code in LANGUAGES]
+        video_filename = Path(video_path).name
+        suffix = "_instrumental" if use_vocal_removal else ""
+        jobs = {
+            lang_code: str(export_dir / f"{video_filename.split('.')[0]}_{lang_code}{suffix}.mp4")
+            for lang_code in lang_codes
+        }
+        
+        # Each language is voiced and mixed as soon as its own translation is ready
+        translations, audio_files, mixed_videos = run_async(localize_all(
+            text, lang_codes, translation_mode, voice_id, str(audio_dir), jobs, video_path,
+            original_volume, voiceover_volume, use_vocal_removal
+        ))
+        
+        session['audio_files'] = audio_files
+        session['mixed_videos'] = mixed_videos
+        session['used_vocal_removal'] = use_vocal_removal
+        return jsonify({
+            'translations': translations,
+            'audio_files': audio_files,
+            'mixed_videos': mixed_videos
+        })
+    except Exception as e:
+        logging.error(f"Generate all error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/transcribe', methods=['POST'])
 def transcribe():
     try:
@@ -582,13 +1256,7 @@ def transcribe():
         if video_file.filename == '':
             return jsonify({'error': 'No video file selected'}), 400
         
-        # Create session-specific directories
-        session_id = session.get('session_id', str(uuid.uuid4()))
-        session['session_id'] = session_id
-        
-        base_dir = Path(f"temp_files/{session_id}")
-        transcription_dir = base_dir / "transcription"
-        transcription_dir.mkdir(parents=True, exist_ok=True)
+        transcription_dir = get_session_dir("transcription")
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         temp_video_path = transcription_dir / f"transcription_video_{timestamp}_{video_file.filename}"
@@ -678,20 +1346,13 @@ def download_all():
         if not mixed_videos:
             return jsonify({'error': 'No videos to download'}), 404
         
-        # Create zip file
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for lang_code, video_path in mixed_videos.items():
-                if os.path.exists(video_path):
-                    zip_file.write(video_path, os.path.basename(video_path))
-        
-        zip_buffer.seek(0)
+        video_paths = [video_path for video_path in mixed_videos.values() if os.path.exists(video_path)]
         
-        return send_file(
-            zip_buffer,
+        # Stream the zip as it is built instead of assembling it first
+        return Response(
+            stream_zip(video_paths),
             mimetype='application/zip',
-            as_attachment=True,
-            download_name='localized_videos.zip'
+            headers={'Content-Disposition': 'attachment; filename=localized_videos.zip'}
         )
     except Exception as e:
         logging.error(f"Download all error: {str(e)}")
@@ -700,7 +1361,6 @@ def download_all():
 if __name__ == '__main__':
     # Create necessary directories
     Path("temp_files").mkdir(exist_ok=True)
-    Path("temp_transcription").mkdir(exist_ok=True)
     
     port = int(os.environ.get('PORT', 5001))  # Changed default from 5000 to 5001
     app.run(host='0.0.0.0', port=port, debug=False) 
\ No newline at end of file